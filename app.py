@@ -1,6 +1,7 @@
 import streamlit as st
 import spacy
 import pandas as pd
+import numpy as np
 import requests
 from bs4 import BeautifulSoup
 import json
@@ -8,6 +9,18 @@ import re
 import urllib3
 import subprocess
 import os
+import bisect
+import contextlib
+from array import array
+from collections import OrderedDict
+import fcntl
+import hashlib
+import queue
+import socket
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import random
 from selenium import webdriver
@@ -16,8 +29,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from fuzzywuzzy import fuzz
+from spacy.matcher import Matcher, PhraseMatcher
+from spacy.util import filter_spans
 import time
 import nltk
+from nlp_worker import RemoteNLP
 
 # Page configuration must be the first Streamlit command
 st.set_page_config(
@@ -254,8 +270,18 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Optional shared NLP worker (see nlp_worker.py), e.g. http://127.0.0.1:8765
+NLP_WORKER_URL = os.environ.get("NEWSNEX_NLP_WORKER", "")
+
 @st.cache_resource(show_spinner=False)
 def load_nlp_model():
+    if NLP_WORKER_URL:
+        try:
+            nlp = RemoteNLP(NLP_WORKER_URL)
+            nlp.ping()
+            return nlp
+        except requests.RequestException:
+            st.warning(f"NLP worker at {NLP_WORKER_URL} is not reachable, loading the model locally.")
     try:
         return spacy.load("en_core_web_sm")
     except OSError:
@@ -284,11 +310,337 @@ def setup_selenium():
     })
     return driver
 
+# Optional list of known organisations, one per line
+COMPANY_GAZETTEER_FILE = "companies.txt"
+# A company is learned once very-high-confidence profiles name it in this many distinct articles
+COMPANY_MIN_SOURCES = 2
+
+class CompanyGazetteer:
+    """Known organisation names compiled into a single PhraseMatcher index.
+
+    Each name is its own match key, so a wrongly learned name can be removed.
+    """
+
+    def __init__(self, nlp, names=()):
+        self.nlp = nlp
+        self.matcher = PhraseMatcher(nlp.vocab)
+        self.names = set()
+        self.lock = threading.Lock()
+        self.add(names)
+
+    def add(self, names):
+        """Add organisation names to the index, skipping ones already known."""
+        new_names = []
+        for name in names:
+            name = name.strip() if name else ""
+            if name and name not in self.names:
+                new_names.append(name)
+        if not new_names:
+            return
+        patterns = [self.nlp.make_doc(name) for name in new_names]
+        with self.lock:
+            for name, pattern in zip(new_names, patterns):
+                self.matcher.add(name, [pattern])
+            self.names.update(new_names)
+
+    def remove(self, name):
+        with self.lock:
+            if name in self.names:
+                self.matcher.remove(name)
+                self.names.discard(name)
+
+    def known(self):
+        with self.lock:
+            return sorted(self.names)
+
+    def find(self, doc):
+        """Return non-overlapping organisation spans in the document, sorted by offset."""
+        with self.lock:
+            matches = self.matcher(doc, as_spans=True)
+        # NER organisations cover names not yet in the gazetteer
+        matches.extend(ent for ent in doc.ents if ent.label_ == "ORG")
+        return filter_spans(matches)
+
+@st.cache_resource(show_spinner=False)
+def load_company_gazetteer():
+    """Build the company gazetteer from the optional names file and past results."""
+    history = load_prospect_history()
+    names = []
+    if os.path.exists(COMPANY_GAZETTEER_FILE):
+        with open(COMPANY_GAZETTEER_FILE, encoding="utf-8") as f:
+            names = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    forgotten = history.forgotten_companies()
+    names = [name for name in names if name not in forgotten]
+    names.extend(history.companies())
+    return CompanyGazetteer(load_nlp_model(), names)
+
+# Optional extra job titles for the designation lexicon, one per line
+DESIGNATION_LEXICON_FILE = "designations.txt"
+
+# Job titles recognised as designations. Multi-word titles and acronyms
+# (written in upper case) match in any case; single-word titles must be
+# capitalised so prose like "will partner with" is not taken as a title.
+# A trailing "of" requires a title-cased remainder (e.g. "Head of Engineering").
+DESIGNATION_TITLES = [
+    "chief executive officer", "chief financial officer", "chief operating officer",
+    "chief technology officer", "chief information officer", "chief marketing officer",
+    "chief product officer", "chief revenue officer", "chief digital officer",
+    "chief data officer", "chief risk officer", "chief human resources officer",
+    "chief strategy officer", "chief investment officer", "chief legal officer",
+    "chief information security officer", "chief executive", "chief economist",
+    "CEO", "CFO", "COO", "CTO", "CIO", "CMO", "CPO", "CHRO", "CISO", "MD",
+    "managing director", "executive director", "non-executive director", "director",
+    "chairman", "chairperson", "chairwoman", "president", "vice president", "vice-president",
+    "VP", "SVP", "EVP", "founder", "co-founder", "cofounder", "managing partner", "partner",
+    "general manager", "country manager", "head of", "secretary", "minister", "governor",
+    "general counsel", "treasurer", "trustee",
+]
+
+# Words that may precede a title (e.g. "Senior VP", "Joint Managing Director")
+DESIGNATION_MODIFIERS = [
+    "senior", "sr", "executive", "deputy", "assistant", "associate", "group", "global",
+    "joint", "additional", "regional", "interim", "acting", "former", "co",
+]
+
+class DesignationMatcher:
+    """Title lexicon compiled into a token-level Matcher, built once at load time.
+
+    Single-word titles match when capitalised ("Chairman", "CHAIRMAN"). In
+    lower case they are ordinary words, so "chairman" only counts next to a
+    person, an organisation or another proper noun ("Tata Sons chairman N
+    Chandrasekaran"); the proper noun covers names NER misses.
+    """
+    ENTITY_TYPES = ("PERSON", "ORG")
+
+    def __init__(self, nlp, titles):
+        self.matcher = Matcher(nlp.vocab)
+        prefix = [{"LOWER": {"IN": DESIGNATION_MODIFIERS}, "OP": "*"}]
+        suffix = [
+            {"LOWER": "of"},
+            {"IS_TITLE": True, "ENT_TYPE": {"NOT_IN": ["PERSON", "ORG"]}, "OP": "+"},
+        ]
+        patterns = []
+        lowercase_patterns = []
+        for title in titles:
+            words = [token.lower_ for token in nlp.make_doc(title)]
+            if not words:
+                continue
+            if words[-1] == "of":
+                patterns.append(prefix + [{"LOWER": word} for word in words[:-1]] + suffix)
+                continue
+            if len(words) == 1 and not title.isupper():
+                title_patterns = [
+                    prefix + [{"LOWER": words[0], "IS_TITLE": True}],
+                    prefix + [{"LOWER": words[0], "IS_UPPER": True}],
+                ]
+                lowercase_pattern = prefix + [{"LOWER": words[0], "IS_LOWER": True}]
+                lowercase_patterns.extend([lowercase_pattern, lowercase_pattern + suffix])
+            else:
+                title_patterns = [prefix + [{"LOWER": word} for word in words]]
+            for title_pattern in title_patterns:
+                patterns.append(title_pattern)
+                patterns.append(title_pattern + suffix)
+        self.matcher.add("DESIGNATION", patterns, greedy="LONGEST")
+        self.matcher.add("DESIGNATION_LOWERCASE", lowercase_patterns, greedy="LONGEST")
+
+    def is_name(self, token):
+        return token.ent_type_ in self.ENTITY_TYPES or token.pos_ == "PROPN"
+
+    def next_to_name(self, span):
+        """Whether a name directly precedes or follows the span.
+
+        One punctuation token may sit in between, and "of" or "at" after it.
+        """
+        doc = span.doc
+        i = span.start - 1
+        if i >= 0 and doc[i].is_punct:
+            i -= 1
+        if i >= 0 and self.is_name(doc[i]):
+            return True
+        i = span.end
+        if i < len(doc) and (doc[i].is_punct or doc[i].lower_ in ("of", "at")):
+            i += 1
+        return i < len(doc) and self.is_name(doc[i])
+
+    def find(self, doc):
+        """Return non-overlapping designation spans in the document, sorted by offset."""
+        spans = [
+            span for span in self.matcher(doc, as_spans=True)
+            if span.label_ != "DESIGNATION_LOWERCASE" or self.next_to_name(span)
+        ]
+        return filter_spans(spans)
+
+def load_designation_titles():
+    """Built-in titles plus those of the optional lexicon file."""
+    titles = list(DESIGNATION_TITLES)
+    if os.path.exists(DESIGNATION_LEXICON_FILE):
+        with open(DESIGNATION_LEXICON_FILE, encoding="utf-8") as f:
+            titles.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    return titles
+
+@st.cache_resource(show_spinner=False)
+def load_designation_matcher():
+    """Build the designation matcher from the built-in and optional extra titles."""
+    return DesignationMatcher(load_nlp_model(), load_designation_titles())
+
+def title_abbreviations(titles):
+    """Map each acronym in the title lexicon to the spelled-out titles it stands for.
+
+    An acronym stands for a title whose word initials it spells, optionally
+    after one modifier ("SVP" -> "senior vice president").
+    """
+    spelled = {}
+    for title in titles:
+        words = re.findall(r'[a-z]+', title.lower())
+        if len(words) > 1:
+            spelled.setdefault(''.join(word[0] for word in words), set()).add(' '.join(words))
+    
+    abbreviations = {}
+    for title in titles:
+        if not (title.isupper() and title.isalpha()):
+            continue
+        acronym = title.lower()
+        expansions = set(spelled.get(acronym, ()))
+        for modifier in DESIGNATION_MODIFIERS:
+            # Short modifiers ("sr", "co") are abbreviations themselves
+            if len(modifier) > 2 and acronym[0] == modifier[0]:
+                expansions.update(f"{modifier} {spelled_title}" for spelled_title in spelled.get(acronym[1:], ()))
+        if expansions:
+            abbreviations[acronym] = sorted(expansions)
+    return abbreviations
+
+def nearest_span(spans, start, end, lower=0, upper=None):
+    """Find the span closest to the [start, end) offsets within [lower, upper).
+
+    ``spans`` must be non-overlapping and sorted by offset; spans overlapping
+    the target itself are ignored.
+    """
+    if upper is None:
+        upper = float("inf")
+    i = bisect.bisect_left(spans, start, key=lambda span: span.start_char)
+    
+    # Nearest span ending before the target
+    left = None
+    j = i - 1
+    while j >= 0 and spans[j].end_char > start:
+        j -= 1
+    if j >= 0 and spans[j].start_char >= lower:
+        left = spans[j]
+    
+    # Nearest span starting after the target
+    right = None
+    k = i
+    while k < len(spans) and spans[k].start_char < end:
+        k += 1
+    if k < len(spans) and spans[k].end_char <= upper:
+        right = spans[k]
+    
+    if left is None or right is None:
+        return left or right
+    if start - left.end_char < right.start_char - end:
+        return left
+    return right
+
+def linkedin_search_url(name, company):
+    """Build the Google search URL used to find a profile on LinkedIn."""
+    search_terms = [name]
+    if company:
+        search_terms.append(company.split()[0])
+    return "https://www.google.com/search?q=LinkedIn+" + "+".join(search_terms).replace(" ", "+")
+
+class ProfileColumns:
+    """Column-oriented profile accumulator that converts cheaply to a DataFrame.
+
+    Profiles are appended straight into per-field column buffers; no
+    per-profile objects are kept. Designation and company repeat across
+    profiles, so they are dictionary-encoded: their buffers are ``array('I')``
+    codes into a list of distinct strings, and a DataFrame wraps those codes
+    with ``Categorical.from_codes`` instead of factorizing the strings again.
+    """
+    FIELDS = ("name", "designation", "company", "quote", "context")
+    CATEGORICAL_FIELDS = ("designation", "company")
+
+    def __init__(self):
+        self.columns = {
+            field: array('I') if field in self.CATEGORICAL_FIELDS else []
+            for field in self.FIELDS
+        }
+        self.categories = {field: [] for field in self.CATEGORICAL_FIELDS}  # Code -> string
+        self.codes = {field: {} for field in self.CATEGORICAL_FIELDS}  # String -> code
+
+    def __len__(self):
+        return len(self.columns["name"])
+
+    def encode(self, field, value):
+        """Return the dictionary code of a designation or company, adding it if new."""
+        code = self.codes[field].get(value)
+        if code is None:
+            code = self.codes[field][value] = len(self.categories[field])
+            self.categories[field].append(value)
+        return code
+
+    def code_array(self, field):
+        return np.frombuffer(self.columns[field], dtype=np.uintc)
+
+    def values(self, field):
+        """Return the decoded values of a field."""
+        if field not in self.CATEGORICAL_FIELDS:
+            return self.columns[field]
+        categories = self.categories[field]
+        return [categories[code] for code in self.columns[field]]
+
+    def append(self, name, designation="", company="", quote="", context=""):
+        """Append one profile to the column buffers."""
+        columns = self.columns
+        columns["name"].append(name)
+        columns["designation"].append(self.encode("designation", designation))
+        columns["company"].append(self.encode("company", company))
+        columns["quote"].append(quote)
+        columns["context"].append(context)
+
+    def extend(self, other):
+        """Append all profiles of another accumulator, column by column."""
+        for field, column in self.columns.items():
+            if field in self.CATEGORICAL_FIELDS:
+                # Translate the other accumulator's codes into this one's
+                mapping = np.array([self.encode(field, value) for value in other.categories[field]], dtype=np.uintc)
+                column.frombytes(mapping[other.code_array(field)].tobytes())
+            else:
+                column.extend(other.columns[field])
+
+    def take(self, indices):
+        """Return a new accumulator with the profiles at the given row positions."""
+        taken = ProfileColumns()
+        indices = np.asarray(indices, dtype=np.intp)
+        for field, column in self.columns.items():
+            if field in self.CATEGORICAL_FIELDS:
+                taken.categories[field] = list(self.categories[field])
+                taken.codes[field] = dict(self.codes[field])
+                taken.columns[field].frombytes(self.code_array(field)[indices].tobytes())
+            else:
+                taken.columns[field] = [column[i] for i in indices]
+        return taken
+
+    def to_frame(self):
+        """Build a DataFrame, deriving LinkedIn search URLs at export time."""
+        data = {}
+        for field, column in self.columns.items():
+            if field in self.CATEGORICAL_FIELDS:
+                data[field] = pd.Categorical.from_codes(self.code_array(field), self.categories[field])
+            else:
+                data[field] = column
+        data["linkedin_search"] = [
+            linkedin_search_url(name, company)
+            for name, company in zip(self.columns["name"], self.values("company"))
+        ]
+        return pd.DataFrame(data)
+
 class ProfileExtractor:
     def __init__(self):
         self.nlp = load_nlp_model()
         self.session = requests.Session()
-        self.seen_profiles = set()  # Cache for deduplication
+        self.gazetteer = load_company_gazetteer()
+        self.designations = load_designation_matcher()
         
         # Common name prefixes
         self.name_prefixes = {
@@ -308,19 +660,15 @@ class ProfileExtractor:
         """Generate a unique key for deduplication."""
         return f"{name.lower()}|{company.lower()}" if company else name.lower()
 
-    def is_duplicate(self, name, company):
-        """Check if a profile is a duplicate based on name and company."""
-        key = self.get_profile_key(name, company)
-        return key in self.seen_profiles
-
-    def add_to_cache(self, name, company):
-        """Add a profile to the deduplication cache."""
-        key = self.get_profile_key(name, company)
-        self.seen_profiles.add(key)
-
-    def clear_cache(self):
-        """Clear the deduplication cache."""
-        self.seen_profiles.clear()
+    def deduplicate(self, profiles, seen):
+        """Drop profiles whose key is already in ``seen`` and add the rest to it."""
+        keep = []
+        for i, (name, company) in enumerate(zip(profiles.columns["name"], profiles.values("company"))):
+            key = self.get_profile_key(name, company)
+            if key not in seen:
+                keep.append(i)
+                seen.add(key)
+        return profiles.take(keep)
 
     def clean_name(self, name):
         """Basic name cleaning with minimal validation."""
@@ -535,10 +883,10 @@ class ProfileExtractor:
     def extract_profiles(self, text):
         """Extract profiles with simplified rules."""
         if not text:
-            return []
+            return ProfileColumns()
         
         doc = self.nlp(text)
-        profiles = []
+        profiles = ProfileColumns()
         seen_names = set()
         
         # First pass: Find all quoted statements and their speakers
@@ -548,21 +896,11 @@ class ProfileExtractor:
             quote = match.group(1).strip()
             speaker = match.group(2).strip()
             if speaker:
-                quote_speakers[speaker] = quote
-        
-        # Second pass: Find company associations
-        company_associations = {}
-        company_patterns = [
-            (r'([A-Z][a-zA-Z]+)(?:\s+(?:of|from|at|with))?\s+([A-Z][A-Za-z0-9]+(?:\s*,?\s*(?:Inc|Ltd|LLC|Corp|Corporation|Company|Group|Technologies|Solutions))?)', 2),
-            (r'([A-Z][a-zA-Z]+)\s*,?\s*([A-Z][A-Za-z0-9]+(?:\s*,?\s*(?:Inc|Ltd|LLC|Corp|Corporation|Company|Group|Technologies|Solutions))?)', 2),
-        ]
+                quote_speakers[speaker] = (quote, match.start(2), match.end(2))
         
-        for pattern, group in company_patterns:
-            for match in re.finditer(pattern, text):
-                name = match.group(1).strip()
-                company = match.group(group).strip()
-                if name and company:
-                    company_associations[name] = company
+        # Second pass: Match known organisations and job titles in one pass over the document
+        companies = self.gazetteer.find(doc)
+        designations = self.designations.find(doc)
         
         # Process sentences for additional context
         for sent in doc.sents:
@@ -575,127 +913,133 @@ class ProfileExtractor:
                     if not name or name in seen_names:
                         continue
                     
-                    # Check if we have a quote or company for this name
-                    quote = quote_speakers.get(name, "")
-                    company = company_associations.get(name, "")
+                    # Check if we have a quote or a nearby company for this name
+                    quote = quote_speakers.get(name, ("",))[0]
+                    company_span = nearest_span(
+                        companies, ent.start_char, ent.end_char, sent.start_char, sent.end_char
+                    )
+                    company = company_span.text if company_span is not None else ""
                     
                     # If we have either a quote or company, create a profile
                     if quote or company:
-                        # Look for designation in the sentence
-                        designation = ""
-                        designation_pattern = r'(?:is|was|as|serves?\s+as)?\s*(?:the\s+)?([A-Z][A-Za-z\s\-]+(?:Chief|CEO|CTO|CFO|COO|CIO|President|Director|Manager|Lead|Head|Officer|Executive))'
-                        designation_match = re.search(designation_pattern, sent_text, re.IGNORECASE)
-                        if designation_match:
-                            designation = designation_match.group(1).strip()
-                        
-                        # Generate LinkedIn search URL
-                        search_terms = [name]
-                        if company:
-                            search_terms.append(company.split()[0])
-                        
-                        linkedin_url = (
-                            "https://www.google.com/search?q=LinkedIn+"
-                            + "+".join(search_terms).replace(" ", "+")
+                        # Attach the nearest title in the sentence
+                        designation_span = nearest_span(
+                            designations, ent.start_char, ent.end_char, sent.start_char, sent.end_char
                         )
+                        designation = designation_span.text if designation_span is not None else ""
                         
-                        profile = {
-                            "name": name,
-                            "designation": designation,
-                            "company": company,
-                            "quote": quote,
-                            "linkedin_search": linkedin_url,
-                            "confidence": "high" if (company and quote) else "medium"
-                        }
-                        
-                        profiles.append(profile)
+                        profiles.append(name, designation, company, quote, sent_text)
                         seen_names.add(name)
-            
-            # Also check for single-word names in quotes
-            for name, quote in quote_speakers.items():
-                if name not in seen_names:
-                    clean_name = self.clean_name(name)
-                    if not clean_name:
-                        continue
-                    
-                    company = company_associations.get(name, "")
-                    
-                    # Generate LinkedIn search URL
-                    search_terms = [clean_name]
-                    if company:
-                        search_terms.append(company.split()[0])
-                    
-                    linkedin_url = (
-                        "https://www.google.com/search?q=LinkedIn+"
-                        + "+".join(search_terms).replace(" ", "+")
-                    )
-                    
-                    profile = {
-                        "name": clean_name,
-                        "designation": "",
-                        "company": company,
-                        "quote": quote,
-                        "linkedin_search": linkedin_url,
-                        "confidence": "high" if company else "medium"
-                    }
-                    
-                    profiles.append(profile)
-                    seen_names.add(clean_name)
+        
+        # Also check for single-word names in quotes
+        for name, (quote, start, end) in quote_speakers.items():
+            if name not in seen_names:
+                clean_name = self.clean_name(name)
+                if not clean_name:
+                    continue
+                
+                company = ""
+                designation = ""
+                context = ""
+                speaker = doc.char_span(start, end, alignment_mode="expand")
+                if speaker is not None:
+                    sent = speaker.sent
+                    context = sent.text
+                    company_span = nearest_span(companies, start, end, sent.start_char, sent.end_char)
+                    if company_span is not None:
+                        company = company_span.text
+                    designation_span = nearest_span(designations, start, end, sent.start_char, sent.end_char)
+                    if designation_span is not None:
+                        designation = designation_span.text
+                
+                profiles.append(clean_name, designation, company, quote, context)
+                seen_names.add(clean_name)
         
         return profiles
 
+# Context keywords that each add a point in score_profiles
+ROLE_CHANGE_TERMS = ['joined', 'appointed', 'promoted', 'leads', 'heading']
+EXPERIENCE_TERMS = ['years', 'experience', 'professional', 'career']
+
 def validate_profile(name, designation, company, context):
-    """Enhanced profile validation with scoring system."""
-    score = 0
-    confidence = "low"
+    """Enhanced profile validation with scoring system.
+
+    Scores one profile through score_profiles, so single profiles and batches
+    share the same 0-8 rules and confidence tiers.
+    """
+    row = score_profiles(pd.DataFrame({
+        'name': [name or ""],
+        'designation': [designation or ""],
+        'company': [company or ""],
+        'context': [context['text']],
+    })).iloc[0]
+    return {
+        'is_valid': bool(row['is_valid']),
+        'score': int(row['score']),
+        'confidence': row['confidence']
+    }
+
+def score_profiles(df):
+    """Score a DataFrame of candidate profiles on the 0-8 validation scheme.
+
+    Adds ``score``, ``confidence`` and ``is_valid`` columns using vectorised
+    string operations; context keyword flags are computed once per distinct
+    context rather than once per profile. validate_profile wraps this for a
+    single profile.
+    """
+    name = df['name'].astype(str)
+    designation = df['designation'].astype(str)
+    company = df['company'].astype(str)
     
     # Name validation (0-2 points)
-    if name and len(name.split()) >= 2:
-        score += 1
-        if re.match(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+$', name):  # Proper capitalization
-            score += 1
-    
-    # Designation validation (0-2 points)
-    if designation:
-        score += 1
-        if len(designation.split()) >= 2:  # Detailed designation
-            score += 1
-    
-    # Company validation (0-2 points)
-    if company:
-        score += 1
-        if len(company.split()) >= 2:  # Multi-word company name
-            score += 1
+    name_words = name.str.count(r'\S+').to_numpy()
+    proper_name = name.str.match(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+$').to_numpy(dtype=bool)
+    score = (name_words >= 2).astype(np.int8)
+    score += (name_words >= 2) & proper_name
     
-    # Context validation (0-2 points)
-    context_lower = context['text'].lower()
-    if any(term in context_lower for term in ['joined', 'appointed', 'promoted', 'leads', 'heading']):
-        score += 1
-    if any(term in context_lower for term in ['years', 'experience', 'professional', 'career']):
-        score += 1
+    # Designation and company validation (0-2 points each)
+    for column in (designation, company):
+        words = column.str.count(r'\S+').to_numpy()
+        score += (column != "").to_numpy()
+        score += words >= 2
     
-    # Determine confidence level
-    if score >= 4:  # Lowered threshold from 5 to 4
-        confidence = "very_high"
-    elif score >= 3:
-        confidence = "high"
-    elif score >= 2:  # Lowered threshold from 3 to 2
-        confidence = "medium"
+    # Context validation (0-2 points), one keyword check per distinct context
+    contexts = df['context'].astype('category').cat
+    context_lower = pd.Series(contexts.categories.astype(str), dtype=object).str.lower()
+    codes = contexts.codes.to_numpy()
+    for terms in (ROLE_CHANGE_TERMS, EXPERIENCE_TERMS):
+        flags = context_lower.str.contains('|'.join(map(re.escape, terms))).to_numpy(dtype=bool)
+        score += flags[codes]
     
-    return {
-        'is_valid': score >= 2,  # Lowered threshold from 3 to 2
-        'score': score,
-        'confidence': confidence
-    }
+    # Determine confidence level
+    df = df.copy()
+    df['score'] = score
+    df['confidence'] = np.select(
+        [score >= 4, score >= 3, score >= 2],
+        ["very_high", "high", "medium"],
+        default="low"
+    )
+    df['is_valid'] = score >= 2
+    return df
+
+def rank_profiles(profiles):
+    """Score accumulated profiles and keep the valid ones, best first."""
+    df = score_profiles(profiles.to_frame())
+    df = df[df['is_valid']].sort_values('score', ascending=False, kind='stable')
+    return df.reset_index(drop=True)
 
-def display_results(profiles):
-    if not profiles:
+def display_results(df, key="results"):
+    if df.empty:
         st.warning("No profiles found.")
         return
     
+    # Keep only the columns shown and exported
+    df = df.drop(columns=['context', 'is_valid'], errors='ignore')
+    
     # Calculate metrics
-    total_prospects = len(profiles)
-    complete_profiles = sum(1 for p in profiles if p['designation'] and p['company'])
-    unique_companies = len(set(p['company'] for p in profiles if p['company']))
+    total_prospects = len(df)
+    complete_profiles = int(((df['designation'] != "") & (df['company'] != "")).sum())
+    unique_companies = df.loc[df['company'] != "", 'company'].nunique()
     
     # Display metrics
     col1, col2, col3 = st.columns(3)
@@ -733,10 +1077,6 @@ def display_results(profiles):
             unsafe_allow_html=True
         )
 
-    # Create DataFrame with clean formatting
-    df = pd.DataFrame(profiles)
-    df['confidence'] = df['confidence'].apply(lambda x: f"{x:.0f}%")
-    
     # Display results
     st.markdown("### 📋 Extracted Profiles")
     st.dataframe(
@@ -749,7 +1089,8 @@ def display_results(profiles):
             "company": "Company",
             "quote": st.column_config.ListColumn("Quotes"),
             "linkedin_search": st.column_config.LinkColumn("LinkedIn Search"),
-            "confidence": "Confidence"
+            "confidence": "Confidence",
+            "score": st.column_config.NumberColumn("Score", help="Validation score (0-8)")
         }
     )
     
@@ -761,16 +1102,636 @@ def display_results(profiles):
             label="📥 Download CSV",
             data=csv,
             file_name=f"profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
+            mime="text/csv",
+            key=f"{key}_csv"
         )
     with col2:
-        json_str = json.dumps(profiles, indent=2)
+        json_str = df.to_json(orient="records", indent=2)
         st.download_button(
             label="📥 Download JSON",
             data=json_str,
             file_name=f"profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-            mime="application/json"
+            mime="application/json",
+            key=f"{key}_json"
+        )
+
+class NearDuplicateIndex:
+    """SimHash fingerprints of article text in a banded LSH index.
+
+    Syndicated copies of a story (PTI, Reuters, ...) differ only in bylines
+    and boilerplate, so their 64-bit fingerprints are at most a few bits apart.
+    The fingerprint only finds candidates: a candidate is reused only if the
+    exact Jaccard similarity of the two shingle sets is at least
+    ``min_similarity``, so a chance collision never hands one article's people
+    to another. Only the ``max_entries`` most recently used articles are kept.
+    """
+    BANDS = 8
+    BAND_BITS = 8
+
+    def __init__(self, max_distance=7, min_similarity=0.8, shingle_size=3, max_entries=5000):
+        # With 8 bands, fingerprints within 7 bits always share at least one band exactly
+        self.max_distance = max_distance
+        self.min_similarity = min_similarity
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.buckets = [{} for _ in range(self.BANDS)]
+        self.entries = OrderedDict()  # Entry ID -> (fingerprint, results), least recently used first
+        self.next_entry = 0
+        self.lock = threading.Lock()
+
+    def fingerprint(self, text):
+        """Compute the SimHash and the sorted shingle hashes of the text, or None for empty text.
+
+        Repeated shingles are counted once so boilerplate repeated within an
+        article does not outweigh the content that differs.
+        """
+        words = re.findall(r'\w+', text.lower())
+        if not words:
+            return None
+        size = min(self.shingle_size, len(words))
+        shingles = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'little')
+             for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        positions = np.arange(64, dtype=np.uint64)
+        bit_counts = ((hashes[:, None] >> positions) & np.uint64(1)).sum(axis=0)
+        majority = (bit_counts * 2 > len(shingles)).astype(np.uint64)
+        # 32 bits per shingle is plenty to compare two articles and halves the memory kept per entry
+        shingle_hashes = np.unique((hashes & np.uint64(0xFFFFFFFF)).astype(np.uint32))
+        return int((majority << positions).sum()), shingle_hashes
+
+    def similarity(self, shingles, other):
+        """Jaccard similarity of two sorted shingle hash arrays."""
+        # The size ratio bounds the similarity, so most candidates need no intersection
+        if min(len(shingles), len(other)) < self.min_similarity * max(len(shingles), len(other)):
+            return 0.0
+        common = len(np.intersect1d(shingles, other, assume_unique=True))
+        return common / (len(shingles) + len(other) - common)
+
+    def bands(self, fingerprint):
+        mask = (1 << self.BAND_BITS) - 1
+        return [(fingerprint >> (band * self.BAND_BITS)) & mask for band in range(self.BANDS)]
+
+    def find(self, fingerprint):
+        """Return the cached results of a near-duplicate article, or None."""
+        if fingerprint is None:
+            return None
+        simhash, shingles = fingerprint
+        with self.lock:
+            for bucket, key in zip(self.buckets, self.bands(simhash)):
+                for entry in bucket.get(key, ()):
+                    (other, other_shingles), results = self.entries[entry]
+                    if ((simhash ^ other).bit_count() <= self.max_distance
+                            and self.similarity(shingles, other_shingles) >= self.min_similarity):
+                        self.entries.move_to_end(entry)
+                        return results
+        return None
+
+    def add(self, fingerprint, results):
+        """Index an article's fingerprint with the results extracted from it."""
+        if fingerprint is None:
+            return
+        with self.lock:
+            entry = self.next_entry
+            self.next_entry += 1
+            self.entries[entry] = (fingerprint, results)
+            for bucket, key in zip(self.buckets, self.bands(fingerprint[0])):
+                bucket.setdefault(key, set()).add(entry)
+            
+            # Evict the least recently used articles from the entries and their buckets
+            while len(self.entries) > self.max_entries:
+                evicted, ((old_simhash, _), _) = self.entries.popitem(last=False)
+                for bucket, key in zip(self.buckets, self.bands(old_simhash)):
+                    bucket[key].discard(evicted)
+                    if not bucket[key]:
+                        del bucket[key]
+
+# Every extracted profile is kept here, indexed for search across past runs
+HISTORY_DB = os.environ.get("NEWSNEX_HISTORY_DB", "newsnex_history.db")
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    job_id TEXT,
+    extracted_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    article_id INTEGER NOT NULL REFERENCES articles(id),
+    name TEXT NOT NULL,
+    designation TEXT,
+    company TEXT,
+    quote TEXT,
+    score INTEGER,
+    confidence TEXT,
+    seen_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_seen_at ON profiles(seen_at);
+CREATE INDEX IF NOT EXISTS profiles_company ON profiles(company);
+CREATE TABLE IF NOT EXISTS forgotten_companies (
+    name TEXT PRIMARY KEY,
+    forgotten_at TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS profiles_fts USING fts5(
+    name, company, designation, quote, content='profiles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS profiles_fts_insert AFTER INSERT ON profiles BEGIN
+    INSERT INTO profiles_fts(rowid, name, company, designation, quote)
+    VALUES (new.id, new.name, new.company, new.designation, new.quote);
+END;
+"""
+
+class ProspectHistory:
+    """SQLite store of every extracted profile, linked to its source article.
+
+    Name, company, designation and quote are indexed with FTS5 so past
+    prospects can be searched without re-running extraction. Designation
+    searches also match the abbreviated or spelled-out form of a title
+    ("CFO" finds "Chief Financial Officer" and the other way round).
+    """
+
+    def __init__(self, path=HISTORY_DB, titles=DESIGNATION_TITLES):
+        self.lock = threading.Lock()
+        # Other app processes may be writing to the same database
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(HISTORY_SCHEMA)
+        
+        # Every form of a title -> all forms it can be searched by
+        self.title_forms = {}
+        for acronym, expansions in title_abbreviations(titles).items():
+            for form in [acronym] + expansions:
+                self.title_forms.setdefault(form, {form}).update([acronym] + expansions)
+
+    def record(self, source, job_id, profiles):
+        """Store the scored profiles extracted from one article."""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock, self.conn:
+            article_id = self.conn.execute(
+                "INSERT INTO articles (source, job_id, extracted_at) VALUES (?, ?, ?)",
+                (source, job_id, now)
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO profiles (article_id, name, designation, company, quote, score, confidence, seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (article_id, row.name, row.designation, row.company, row.quote,
+                     int(row.score), row.confidence, now)
+                    for row in profiles.itertuples(index=False)
+                ]
+            )
+
+    def sources(self, job_id):
+        """Sources already recorded for a job."""
+        with self.lock:
+            rows = self.conn.execute("SELECT source FROM articles WHERE job_id = ?", (job_id,)).fetchall()
+        return {source for (source,) in rows}
+
+    def last_id(self):
+        """ID of the most recently recorded profile."""
+        with self.lock:
+            return self.conn.execute("SELECT max(id) FROM profiles").fetchone()[0]
+
+    def companies(self, candidates=None):
+        """Companies trusted enough to join the gazetteer, optionally among candidates.
+
+        A company qualifies once very-high-confidence profiles name it in at
+        least COMPANY_MIN_SOURCES distinct articles and it has not been forgotten.
+        """
+        sql = (
+            "SELECT p.company FROM profiles p JOIN articles a ON a.id = p.article_id "
+            "WHERE p.company != '' AND p.confidence = 'very_high' "
+            "AND p.company NOT IN (SELECT name FROM forgotten_companies)"
+        )
+        params = []
+        if candidates is not None:
+            candidates = list(candidates)
+            if not candidates:
+                return []
+            sql += f" AND p.company IN ({', '.join('?' * len(candidates))})"
+            params.extend(candidates)
+        sql += " GROUP BY p.company HAVING COUNT(DISTINCT a.source) >= ?"
+        params.append(COMPANY_MIN_SOURCES)
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [company for (company,) in rows]
+
+    def forgotten_companies(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT name FROM forgotten_companies").fetchall()
+        return {name for (name,) in rows}
+
+    def forget_company(self, name):
+        """Keep a wrongly learned company out of the gazetteer from now on."""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO forgotten_companies (name, forgotten_at) VALUES (?, ?)", (name, now)
+            )
+
+    @staticmethod
+    def match_terms(column, text):
+        """Turn user input into FTS5 prefix terms, optionally limited to one column."""
+        words = re.findall(r'\w+', text)
+        terms = ' '.join(f'"{word}"*' for word in words)
+        if not terms:
+            return ""
+        return f"{column} : ({terms})" if column else f"({terms})"
+
+    def designation_terms(self, text):
+        """Match a designation in any of its abbreviated or spelled-out forms."""
+        title = ' '.join(re.findall(r'\w+', text.lower()))
+        if title not in self.title_forms:
+            return self.match_terms("designation", text)
+        forms = ' OR '.join(f'"{form}"*' for form in sorted(self.title_forms[title]))
+        return f"designation : ({forms})"
+
+    def search(self, query="", designation="", company="", since=None, limit=500):
+        """Find past prospects matching the keywords and filters, newest first."""
+        match = ' AND '.join(filter(None, [
+            self.match_terms(None, query),
+            self.designation_terms(designation),
+            self.match_terms("company", company),
+        ]))
+        sql = (
+            "SELECT p.name, p.designation, p.company, p.quote, p.score, p.confidence, "
+            "p.seen_at, a.source FROM profiles p JOIN articles a ON a.id = p.article_id"
         )
+        clauses = []
+        params = []
+        if match:
+            sql += " JOIN profiles_fts f ON f.rowid = p.id"
+            clauses.append("profiles_fts MATCH ?")
+            params.append(match)
+        if since:
+            clauses.append("p.seen_at >= ?")
+            params.append(since.isoformat())
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY p.seen_at DESC LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            return pd.read_sql_query(sql, self.conn, params=params)
+
+@st.cache_resource(show_spinner=False)
+def load_prospect_history():
+    return ProspectHistory(titles=load_designation_titles())
+
+# Background jobs are persisted here so progress and results survive reruns and restarts
+JOB_DIR = os.environ.get("NEWSNEX_JOB_DIR", "jobs")
+JOB_WORKERS = int(os.environ.get("NEWSNEX_JOB_WORKERS", "2"))
+# Set to 0 to extract every article even if a near-duplicate was seen before
+NEAR_DUPLICATES = os.environ.get("NEWSNEX_NEAR_DUPLICATES", "1") != "0"
+ORPHAN_SCAN_INTERVAL = 30  # Seconds between scans for jobs left behind by a dead process
+
+class JobRunner:
+    """Runs extraction jobs on a worker pool that outlives Streamlit script runs.
+
+    Job state lives in the job directory, which several app processes on one
+    host may share. A process claims a job by holding an exclusive lock on its
+    lock file while it works on it. The OS releases the lock when the process
+    exits, so jobs left behind by a dead process can be picked up by any other.
+    Unfinished jobs are indexed by a marker file in ``active/``, so looking for
+    them never reads the status of finished ones.
+    """
+
+    def __init__(self, job_dir=JOB_DIR, workers=JOB_WORKERS, near_duplicates=NEAR_DUPLICATES):
+        self.job_dir = job_dir
+        os.makedirs(os.path.join(job_dir, "active"), exist_ok=True)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="newsnex-job")
+        
+        # One extractor per worker thread; a local spaCy pipeline is shared by all
+        # of them and is not thread-safe, so its calls are serialised, while the
+        # remote NLP worker batches concurrent calls itself
+        self.extractors = queue.Queue()
+        for _ in range(workers):
+            self.extractors.put(ProfileExtractor())
+        nlp = load_nlp_model()
+        self.nlp_lock = contextlib.nullcontext() if isinstance(nlp, RemoteNLP) else threading.Lock()
+        
+        self.near_duplicates = NearDuplicateIndex() if near_duplicates else None
+        self.history = load_prospect_history()
+        self.lock = threading.Lock()
+        self.jobs = {}  # Jobs claimed by this process
+        self.claims = {}  # Job ID -> lock file descriptor held while claimed
+        self.adopt_orphans()
+        threading.Thread(target=self.watch_orphans, name="newsnex-orphans", daemon=True).start()
+
+    def status_path(self, job_id):
+        return os.path.join(self.job_dir, f"{job_id}.json")
+
+    def results_path(self, job_id):
+        return os.path.join(self.job_dir, f"{job_id}.results.json")
+
+    def items_path(self, job_id):
+        return os.path.join(self.job_dir, f"{job_id}.items.json")
+
+    def lock_path(self, job_id):
+        return os.path.join(self.job_dir, f"{job_id}.lock")
+
+    def active_path(self, job_id):
+        return os.path.join(self.job_dir, "active", job_id)
+
+    def claim(self, job_id):
+        """Take the job's lock; return False if another process holds it."""
+        fd = os.open(self.lock_path(job_id), os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self.claims[job_id] = fd
+        return True
+
+    def release(self, job_id):
+        fd = self.claims.pop(job_id, None)
+        if fd is not None:
+            os.close(fd)
+
+    def read_job(self, job_id):
+        """Read a job's status from disk, or None if it is missing or unreadable."""
+        try:
+            with open(self.status_path(job_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def deactivate(self, job_id):
+        """Drop a finished job from the index of unfinished ones."""
+        try:
+            os.remove(self.active_path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def adopt_orphans(self):
+        """Requeue unfinished jobs that no process holds a claim on."""
+        for job_id in os.listdir(os.path.join(self.job_dir, "active")):
+            with self.lock:
+                if job_id in self.claims or not self.claim(job_id):
+                    continue
+            # The previous owner may have finished just before we claimed it
+            job = self.read_job(job_id)
+            if job is None or job["status"] not in ("queued", "running"):
+                if job is not None:
+                    self.deactivate(job_id)
+                with self.lock:
+                    self.release(job_id)
+                continue
+            self.jobs[job_id] = job
+            self.update(job, status="queued", owner=self.owner, done=0, duplicates=0, errors=[])
+            self.executor.submit(self.run, job_id)
+
+    def watch_orphans(self):
+        while True:
+            time.sleep(ORPHAN_SCAN_INTERVAL)
+            try:
+                self.adopt_orphans()
+            except OSError:
+                pass
+
+    def read_items(self, job_id):
+        with open(self.items_path(job_id), encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, job):
+        """Atomically write the job status file."""
+        path = self.status_path(job["id"])
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(job, f)
+        os.replace(path + ".tmp", path)
+
+    def update(self, job, **changes):
+        with self.lock:
+            job.update(changes, updated=datetime.now().isoformat(timespec="seconds"))
+            self.save(job)
+
+    def submit(self, kind, items, deduplicate=True):
+        """Queue a "url" or "text" job over the given items and return its ID."""
+        job_id = uuid.uuid4().hex[:12]
+        # The items are written once; the status file, rewritten after every item, only tracks progress
+        with open(self.items_path(job_id), "w", encoding="utf-8") as f:
+            json.dump(list(items), f)
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "deduplicate": deduplicate,
+            "status": "queued",
+            "done": 0,
+            "total": len(items),
+            "profiles": 0,
+            "duplicates": 0,
+            "errors": [],
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "owner": self.owner,
+        }
+        # Claim before the status file exists so no other process adopts it
+        with self.lock:
+            self.claim(job_id)
+            self.jobs[job_id] = job
+        self.update(job)
+        open(self.active_path(job_id), "w").close()
+        self.executor.submit(self.run, job_id)
+        return job_id
+
+    def run(self, job_id):
+        """Process every item of a job, persisting progress after each one."""
+        extractor = self.extractors.get()
+        try:
+            self.process(self.jobs[job_id], extractor)
+        finally:
+            self.extractors.put(extractor)
+            with self.lock:
+                self.release(job_id)
+
+    def process(self, job, extractor):
+        """Extract, deduplicate and rank the profiles of every item in a job."""
+        job_id = job["id"]
+        try:
+            items = self.read_items(job_id)
+        except (OSError, ValueError) as e:
+            self.update(job, status="failed", errors=[f"Error reading job items: {str(e)}"])
+            self.deactivate(job_id)
+            return
+        self.update(job, status="running")
+        profiles = ProfileColumns()
+        seen = set()
+        errors = []
+        duplicates = 0
+        # An adopted job is processed again from the start to rebuild its results,
+        # but the articles its previous owner already stored are not stored twice
+        try:
+            recorded = self.history.sources(job_id)
+        except sqlite3.Error as e:
+            errors.append(f"Error reading history, articles of this job are not saved to it: {str(e)}")
+            recorded = None
+        
+        for done, item in enumerate(items, start=1):
+            article = None  # Profiles of this item, once extracted
+            try:
+                if job["kind"] == "url":
+                    text = extractor.get_clean_text_from_url(item)
+                    cleaned = text
+                else:
+                    text = item
+                    cleaned = extractor.clean_article_content(text)
+                if text:
+                    # Syndicated copies reuse the profiles of the first copy seen
+                    found = None
+                    if self.near_duplicates is not None:
+                        fingerprint = self.near_duplicates.fingerprint(cleaned)
+                        found = self.near_duplicates.find(fingerprint)
+                    if found is None:
+                        with self.nlp_lock:
+                            found = extractor.extract_profiles(text)
+                        if self.near_duplicates is not None:
+                            self.near_duplicates.add(fingerprint, found)
+                    else:
+                        duplicates += 1
+                    article = found
+                    if job["deduplicate"]:
+                        found = extractor.deduplicate(found, seen)
+                    profiles.extend(found)
+                else:
+                    errors.append(f"No article content found at {item}")
+            except Exception as e:
+                errors.append(f"Error processing {item[:80]}: {str(e)}")
+            
+            # A history failure must not lose the profiles already added to the job
+            source = item if job["kind"] == "url" else f"text:{job_id}"
+            if article is not None and recorded is not None and source not in recorded:
+                try:
+                    article_profiles = rank_profiles(article)
+                    self.history.record(source, job_id, article_profiles)
+                    # Companies join the gazetteer once history has seen them often enough
+                    candidates = set(article_profiles.loc[article_profiles['confidence'] == "very_high", 'company'])
+                    extractor.gazetteer.add(self.history.companies(candidates - {""}))
+                except Exception as e:
+                    errors.append(f"Error saving {item[:80]} to history: {str(e)}")
+            self.update(job, done=done, profiles=len(profiles), duplicates=duplicates, errors=errors)
+        
+        try:
+            ranked = rank_profiles(profiles).drop(columns=['is_valid'])
+            ranked.to_json(self.results_path(job_id), orient="records")
+            self.update(job, status="done", profiles=len(ranked))
+        except Exception as e:
+            errors.append(f"Error saving results: {str(e)}")
+            self.update(job, status="failed", errors=errors)
+        self.deactivate(job_id)
+
+    def list_jobs(self, job_ids):
+        """Return the status of the given jobs from disk, newest first."""
+        jobs = [job for job in map(self.read_job, job_ids) if job is not None]
+        return sorted(jobs, key=lambda job: job["created"], reverse=True)
+
+    def results(self, job_id):
+        """Load the ranked profiles of a finished job."""
+        path = self.results_path(job_id)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        return pd.read_json(path, orient="records", dtype=False)
+
+@st.cache_resource(show_spinner=False)
+def load_job_runner():
+    return JobRunner()
+
+# Results of a finished job never change, so polling reruns reuse them
+@st.cache_data(max_entries=100, show_spinner=False)
+def load_job_results(_runner, job_id):
+    return _runner.results(job_id)
+
+MAX_SESSION_JOBS = 20  # Jobs a session keeps track of and polls
+
+def session_job_ids():
+    """IDs of the jobs submitted from this session, kept in the URL so a reload keeps them."""
+    if "job_ids" not in st.session_state:
+        job_ids = st.query_params.get("jobs", "").split(",")
+        st.session_state.job_ids = [job_id for job_id in job_ids if re.fullmatch(r"[0-9a-f]{12}", job_id)]
+    return st.session_state.job_ids
+
+def remember_job(job_id):
+    job_ids = session_job_ids()
+    job_ids.append(job_id)
+    del job_ids[:-MAX_SESSION_JOBS]
+    st.query_params["jobs"] = ",".join(job_ids)
+
+def display_jobs(runner, job_ids):
+    """Show the status of this session's jobs and the results of finished ones."""
+    jobs = runner.list_jobs(job_ids)
+    if not jobs:
+        st.info("No jobs in this session yet. Submit URLs or text to start one.")
+        return False
+    
+    running = False
+    for job in jobs:
+        running = running or job["status"] in ("queued", "running")
+        label = f"{job['kind'].upper()} job {job['id']} · {job['status']} · {job['done']}/{job['total']} · {job['profiles']} profiles"
+        with st.expander(label, expanded=job["status"] != "done"):
+            st.caption(
+                f"Created {job['created']} · updated {job.get('updated', '')}"
+                f" · {job.get('duplicates', 0)} near-duplicate article(s) reused earlier results"
+            )
+            st.progress(job["done"] / job["total"] if job["total"] else 1.0)
+            for error in job["errors"]:
+                st.warning(error)
+            if job["status"] == "done":
+                display_results(load_job_results(runner, job["id"]), key=job["id"])
+    return running
+
+# Keyed on the newest profile ID, so a search is only rerun once new profiles arrive
+@st.cache_data(max_entries=32, show_spinner=False)
+def search_history(_history, query, designation, company, since, last_id):
+    return _history.search(query, designation, company, since)
+
+def display_history(history, gazetteer):
+    """Search view over every prospect extracted so far."""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        query = st.text_input("Keywords", placeholder="name, company, quote...", key="history_query")
+    with col2:
+        designation = st.text_input("Designation", placeholder="CFO", key="history_designation",
+                                    help="Abbreviated and spelled-out titles match each other")
+    with col3:
+        company = st.text_input("Company", placeholder="Razorpay", key="history_company",
+                                help="Matches company names only; sectors are not recorded")
+    with col4:
+        since = st.date_input("Seen since", value=datetime.now().date().replace(day=1), key="history_since")
+    
+    started = time.perf_counter()
+    df = search_history(history, query, designation, company, since, history.last_id())
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    st.caption(f"{len(df)} prospect(s) found in {elapsed_ms:.1f} ms")
+    
+    with st.expander("Forget a wrongly learned company"):
+        name = st.selectbox("Known company", gazetteer.known(), index=None, key="forget_company")
+        if st.button("Forget company", key="forget_button", disabled=name is None):
+            history.forget_company(name)
+            gazetteer.remove(name)
+            st.success(f"{name} will no longer be matched as a company. Other app processes drop it on restart.")
+    
+    if df.empty:
+        return
+    df['linkedin_search'] = [linkedin_search_url(name, company) for name, company in zip(df['name'], df['company'])]
+    st.dataframe(
+        df,
+        use_container_width=True,
+        height=400,
+        column_config={
+            "name": "Name",
+            "designation": "Designation",
+            "company": "Company",
+            "quote": "Quote",
+            "score": st.column_config.NumberColumn("Score", help="Validation score (0-8)"),
+            "confidence": "Confidence",
+            "seen_at": "Seen",
+            "source": st.column_config.TextColumn("Source", help="Article URL, or text:<job ID> for pasted text"),
+            "linkedin_search": st.column_config.LinkColumn("LinkedIn Search")
+        }
+    )
 
 def main():
     st.markdown('<h1 class="main-title">🧠 NewsNex 📰</h1>', unsafe_allow_html=True)
@@ -779,69 +1740,42 @@ def main():
 
     # Add deduplication toggle
     deduplicate = st.checkbox("Enable deduplication across articles", value=True,
-                            help="Prevents the same person from appearing multiple times across different articles")
+                            help="Prevents the same person from appearing multiple times across the articles of a job")
 
-    tab1, tab2 = st.tabs(["📰 URL Analysis", "Text Analysis"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📰 URL Analysis", "Text Analysis", "📋 Jobs", "🔎 History"])
 
-    extractor = ProfileExtractor()
+    runner = load_job_runner()
     
     with tab1:
-        url = st.text_input("Enter news article URL:", placeholder="https://example.com/article")
+        urls_input = st.text_area("Enter news article URLs (one per line):", height=150,
+                                  placeholder="https://example.com/article", key="url_input")
         if st.button("Extract from URL", key="url_button"):
-            if url:
-                try:
-                    with st.spinner("🔍 Analyzing article..."):
-                        text = extractor.get_clean_text_from_url(url)
-                        if text and not text.startswith("⚠️"):
-                            st.text_area("Extracted Article Content:", text, height=200)
-                            profiles = extractor.extract_profiles(text)
-                            
-                            # Apply deduplication if enabled
-                            if deduplicate:
-                                unique_profiles = []
-                                for profile in profiles:
-                                    if not extractor.is_duplicate(profile['name'], profile['company']):
-                                        unique_profiles.append(profile)
-                                        extractor.add_to_cache(profile['name'], profile['company'])
-                                profiles = unique_profiles
-                            
-                            if profiles:
-                                display_results(profiles)
-                            else:
-                                st.warning("No profiles found in the article. Try a different article or paste the text directly.")
-                        else:
-                            st.warning(text)
-                except Exception as e:
-                    st.error(f"Error processing URL: {str(e)}")
+            urls = [url.strip() for url in urls_input.splitlines() if url.strip()]
+            if urls:
+                job_id = runner.submit("url", urls, deduplicate)
+                remember_job(job_id)
+                st.success(f"✅ Job {job_id} queued for {len(urls)} URL(s). Follow its progress in the Jobs tab.")
+            else:
+                st.warning("Please enter at least one URL")
 
     with tab2:
         text_input = st.text_area("Paste article text:", height=200,
-                                 placeholder="Paste the article content here...")
+                                 placeholder="Paste the article content here...", key="text_input")
         if st.button("Extract from Text", key="text_button"):
             if text_input:
-                with st.spinner("🔍 Processing text..."):
-                    profiles = extractor.extract_profiles(text_input)
-                    
-                    # Apply deduplication if enabled
-                    if deduplicate:
-                        unique_profiles = []
-                        for profile in profiles:
-                            if not extractor.is_duplicate(profile['name'], profile['company']):
-                                unique_profiles.append(profile)
-                                extractor.add_to_cache(profile['name'], profile['company'])
-                        profiles = unique_profiles
-                    
-                    if profiles:
-                        display_results(profiles)
-                    else:
-                        st.warning("No profiles found in the text. Try a different article.")
+                job_id = runner.submit("text", [text_input], deduplicate)
+                remember_job(job_id)
+                st.success(f"✅ Job {job_id} queued. Follow its progress in the Jobs tab.")
             else:
                 st.warning("Please enter some text")
 
-    # Add clear cache button
-    if deduplicate and st.button("Clear deduplication cache"):
-        extractor.clear_cache()
-        st.success("✅ Deduplication cache cleared")
+    with tab3:
+        auto_refresh = st.checkbox("Auto-refresh while jobs are running", value=True, key="auto_refresh")
+        st.button("🔄 Refresh", key="refresh_jobs")
+        jobs_running = display_jobs(runner, session_job_ids())
+
+    with tab4:
+        display_history(runner.history, load_company_gazetteer())
 
     st.markdown(
         """
@@ -852,5 +1786,10 @@ def main():
         unsafe_allow_html=True
     )
 
+    # Poll this session's jobs only; they keep running even if the session goes away
+    if jobs_running and auto_refresh:
+        time.sleep(2)
+        st.rerun()
+
 if __name__ == "__main__":
     main()
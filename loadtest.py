@@ -0,0 +1,416 @@
+"""Concurrent-user load test for the NewsNex app.
+
+Starts the app with ``streamlit run`` in its own process and connects N
+simulated browser sessions to it over Streamlit's websocket protocol. Each
+session drives the URL and text flows against a local stub news server with
+auto-refresh left on, so the server runs the same 2 s polling reruns as it
+does for real users:
+
+    python loadtest.py --sessions 8 --iterations 5 --json loadtest.json
+
+The report covers:
+
+- submit latency, from the click to the rendered "Job queued" message
+- completion latency, from the click to the finished job
+- script runs, including polling reruns, and the server CPU they and the jobs use
+- server memory per idle connected session, measured before any job is submitted
+
+Every flow submits a distinct article, so completion latency measures real
+extraction. Articles that the app still recognises as near-duplicates are
+counted as cache hits in the report; pass --no-near-duplicates to turn the
+index off altogether. Use --max-p99 to fail the run (exit code 1) when
+completion latency regresses.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+FIRST_NAMES = ["Anita", "Rahul", "Priya", "Vikram", "Sundar", "Meera", "Arjun", "Kavya", "Rohan", "Neha",
+               "Farah", "Kiran", "Deepak", "Lakshmi", "Nikhil", "Pooja", "Sanjay", "Tara", "Varun", "Zoya"]
+LAST_NAMES = ["Sharma", "Iyer", "Mehta", "Rao", "Kapoor", "Nair", "Gupta", "Menon", "Reddy", "Bose",
+              "Banerjee", "Chopra", "Desai", "Joshi", "Kulkarni", "Malhotra", "Pillai", "Saxena", "Shah", "Verma"]
+COMPANIES = ["Infosys", "Tata Motors", "Zeta Payments", "Razorpay", "Amadeus", "Wipro", "Paytm", "Flipkart",
+             "Zomato", "Freshworks", "Swiggy", "Nykaa", "Ola Electric", "PhonePe", "Byju's", "Meesho"]
+TITLES = ["Chief Executive Officer", "CFO", "Managing Director", "Senior VP of Engineering", "Head of India",
+          "Chief Technology Officer", "COO", "General Manager", "Vice President of Sales", "Director"]
+CITIES = ["Bengaluru", "Mumbai", "Pune", "Hyderabad", "Chennai", "Gurugram", "Noida", "Kolkata", "Delhi", "Kochi"]
+SECTORS = ["payments", "logistics", "retail", "cloud software", "electric vehicles", "healthcare",
+           "insurance", "edtech", "food delivery", "travel", "cybersecurity", "semiconductors"]
+ACTIONS = ["raised", "invested", "committed", "earmarked", "secured", "allocated"]
+TRENDS = ["rising demand", "tighter regulation", "a talent shortage", "falling costs", "new export rules",
+          "record festive sales", "slower hiring", "a weaker rupee", "fresh venture funding"]
+
+PROSPECT_SENTENCES = [
+    "{name}, {title} at {company}, joined the firm from {other} in {month}.",
+    "{company} has appointed {name} as {title}, effective {month}.",
+    "{name}, who was previously with {other}, takes over as {title} at {company}.",
+    "Speaking in {city}, {name}, {title} of {company}, said the {sector} unit would double headcount.",
+    "{name} has been promoted to {title} at {company} after {years} years with the firm.",
+]
+QUOTE_SENTENCES = [
+    '"We see {trend} reshaping {sector} over the next {years} years," said {first} at {company}.',
+    '"Our {city} team will lead the push into {sector}," {first} told reporters.',
+    '"{trend} is both a risk and an opportunity for us," said {first}.',
+]
+CONTEXT_SENTENCES = [
+    "{company} {action} Rs {amount} crore for its {sector} business in {city}.",
+    "Analysts tracking {sector} expect {trend} to lift margins by {pct} per cent this year.",
+    "The firm employs about {staff} people across {offices} offices, including {city}.",
+    "Shares of {company} moved {pct} per cent on the news in {month} trading.",
+    "Competitors such as {other} are also betting on {sector} amid {trend}.",
+]
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+
+def make_article(article_id, paragraphs=12):
+    """Generate a deterministic synthetic news article with a handful of prospects.
+
+    Sentences are drawn from varied templates and fillers so that distinct
+    article IDs give distinct texts rather than near-duplicates of each other.
+    """
+    rng = random.Random(article_id)
+    sentences = []
+    for _ in range(paragraphs):
+        first = rng.choice(FIRST_NAMES)
+        company, other = rng.sample(COMPANIES, 2)
+        fields = {
+            "name": f"{first} {rng.choice(LAST_NAMES)}",
+            "first": first,
+            "title": rng.choice(TITLES),
+            "company": company,
+            "other": other,
+            "city": rng.choice(CITIES),
+            "sector": rng.choice(SECTORS),
+            "action": rng.choice(ACTIONS),
+            "trend": rng.choice(TRENDS),
+            "month": rng.choice(MONTHS),
+            "years": rng.randint(2, 25),
+            "amount": rng.randint(10, 5000),
+            "pct": rng.randint(1, 40),
+            "staff": rng.randint(200, 90000),
+            "offices": rng.randint(2, 60),
+        }
+        sentences.append(rng.choice(PROSPECT_SENTENCES).format(**fields))
+        sentences.append(rng.choice(QUOTE_SENTENCES).format(**fields))
+        for template in rng.sample(CONTEXT_SENTENCES, rng.randint(1, 3)):
+            sentences.append(template.format(**fields))
+    return " ".join(sentences)
+
+class StubNewsHandler(BaseHTTPRequestHandler):
+    """Serves /article/<id> as an HTML page in the layout the extractor expects."""
+
+    def do_GET(self):
+        match = re.fullmatch(r"/article/(\d+)", self.path)
+        if not match:
+            self.send_error(404)
+            return
+        body = (
+            "<html><body><header>Stub News</header>"
+            f"<article class=\"article-content\"><p>{make_article(int(match.group(1)))}</p></article>"
+            "<footer>All rights reserved</footer></body></html>"
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNewsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_app_server(port, env, timeout):
+    """Run the app with ``streamlit run`` and wait until it answers health checks."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH,
+         "--server.headless=true", f"--server.port={port}", "--server.address=127.0.0.1",
+         "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("streamlit exited during startup")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).ok:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("streamlit did not start in time")
+
+def rss_mb(pid, field="VmRSS"):
+    """Resident memory of a process in MB (Linux only)."""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def cpu_seconds(pid):
+    """User plus system CPU time of a process (Linux only)."""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+def percentile(values, q):
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+def read_job(job_dir, job_id):
+    try:
+        with open(os.path.join(job_dir, f"{job_id}.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+async def wait_for_job(job_dir, job_id, timeout):
+    """Poll the persisted job status until it finishes; return the final job record."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = read_job(job_dir, job_id)
+        if job.get("status") in ("done", "failed"):
+            return job
+        await asyncio.sleep(0.05)
+    return {"status": "timeout"}
+
+class BrowserSession:
+    """A minimal Streamlit client: sends reruns with widget states, reads rendered elements."""
+
+    def __init__(self, port):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.widget_ids = {}  # User key -> widget ID
+        self.alerts = []
+        self.query_string = ""
+        self.script_runs = 0
+        self.running = False
+        self.changed = asyncio.Event()
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, max_message_size=64 * 1024 * 1024)
+        self.reader = asyncio.ensure_future(self.read())
+        await self.rerun()
+
+    async def read(self):
+        while True:
+            data = await self.ws.read_message()
+            if data is None:
+                return
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                widget = getattr(element, element.WhichOneof("type"))
+                widget_id = getattr(widget, "id", "") if hasattr(widget, "DESCRIPTOR") else ""
+                if widget_id and "-" in widget_id:
+                    self.widget_ids[widget_id.rsplit("-", 1)[1]] = widget_id
+                if element.WhichOneof("type") == "alert":
+                    self.alerts.append(element.alert.body)
+            elif kind == "session_status_changed":
+                self.running = msg.session_status_changed.script_is_running
+            elif kind == "page_info_changed":
+                self.query_string = msg.page_info_changed.query_string
+            elif kind == "script_finished":
+                self.script_runs += 1
+            self.changed.set()
+
+    async def wait_for(self, condition, timeout):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.changed.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("no response from the app")
+            try:
+                await asyncio.wait_for(self.changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def send(self, widgets=None):
+        """Request a script run with the given widget values."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query_string
+        for key, value in (widgets or {}).items():
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = self.widget_ids[key]
+            if value is True:
+                state.trigger_value = True
+            else:
+                state.string_value = value
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+    async def rerun(self, widgets=None, timeout=120):
+        """Request a script run and wait for it to finish."""
+        runs = self.script_runs
+        await self.send(widgets)
+        await self.wait_for(lambda: self.script_runs > runs, timeout)
+
+    def close(self):
+        self.ws.close()
+        self.reader.cancel()
+
+async def run_flows(session_id, session, args, base_url, job_dir):
+    results = []
+    for iteration in range(args.iterations):
+        flow = args.flow if args.flow != "both" else ("url", "text")[iteration % 2]
+        # A fresh article for every flow, so no request is served from the near-duplicate index by design
+        article_id = session_id * args.iterations + iteration
+        record = {"session": session_id, "flow": flow}
+        try:
+            if flow == "url":
+                widgets = {"url_input": f"{base_url}/article/{article_id}", "url_button": True}
+            else:
+                widgets = {"text_input": make_article(article_id), "text_button": True}
+            session.alerts.clear()
+            started = time.perf_counter()
+            await session.send(widgets)
+            await session.wait_for(lambda: any("queued" in alert for alert in session.alerts), args.timeout)
+            record["submit_latency"] = time.perf_counter() - started
+
+            job_id = re.search(r"Job (\w+) queued", next(a for a in session.alerts if "queued" in a)).group(1)
+            job = await wait_for_job(job_dir, job_id, args.timeout)
+            record["completion_latency"] = time.perf_counter() - started
+            record["status"] = job["status"]
+            record["cache_hits"] = job.get("duplicates", 0)
+            if record["status"] != "done":
+                record["error"] = f"job {record['status']}"
+        except Exception as e:
+            record["error"] = str(e) or type(e).__name__
+        results.append(record)
+    return results
+
+def summarize(results, sessions, elapsed, server):
+    ok = [r for r in results if "error" not in r]
+    submit = sorted(r["submit_latency"] for r in ok)
+    completion = sorted(r["completion_latency"] for r in ok)
+    extracted = sorted(r["completion_latency"] for r in ok if not r["cache_hits"])
+    return {
+        "sessions": sessions,
+        "flows": len(results),
+        "errors": len(results) - len(ok),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(ok) / elapsed, 3) if elapsed else None,
+        "submit_p50_s": percentile(submit, 50),
+        "submit_p99_s": percentile(submit, 99),
+        "completion_p50_s": percentile(completion, 50),
+        "completion_p99_s": percentile(completion, 99),
+        "cache_hits": sum(r["cache_hits"] for r in ok),
+        "extracted_p50_s": percentile(extracted, 50),
+        "extracted_p99_s": percentile(extracted, 99),
+        **server,
+    }
+
+async def run_load(args, port, base_url, job_dir, pid):
+    # Warm up the shared model and job runner so they are not charged to any session
+    warmup = BrowserSession(port)
+    await warmup.connect()
+    warmup.close()
+    baseline_rss = rss_mb(pid)
+
+    sessions = [BrowserSession(port) for _ in range(args.sessions)]
+    await asyncio.gather(*(session.connect() for session in sessions))
+    idle_rss = rss_mb(pid)
+
+    cpu_started = cpu_seconds(pid)
+    runs_started = sum(session.script_runs for session in sessions)
+    started = time.perf_counter()
+    per_session = await asyncio.gather(*(
+        run_flows(i, session, args, base_url, job_dir) for i, session in enumerate(sessions)
+    ))
+    elapsed = time.perf_counter() - started
+    # Sessions keep polling until their last job is shown as finished
+    await asyncio.gather(*(
+        session.wait_for(lambda session=session: not session.running, args.timeout) for session in sessions
+    ))
+    server = {
+        "script_runs": sum(session.script_runs for session in sessions) - runs_started,
+        "settle_s": round(time.perf_counter() - started - elapsed, 3),
+        "server_cpu_s": round(cpu_seconds(pid) - cpu_started, 3),
+        "server_baseline_rss_mb": round(baseline_rss, 1),
+        "server_rss_mb_per_idle_session": round((idle_rss - baseline_rss) / args.sessions, 2),
+        "server_peak_rss_mb": round(rss_mb(pid, "VmHWM"), 1),
+    }
+    for session in sessions:
+        session.close()
+    results = [record for records in per_session for record in records]
+    return summarize(results, args.sessions, elapsed, server), results
+
+def positive_int(value):
+    value = int(value)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return value
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-user load test for NewsNex")
+    parser.add_argument("--sessions", type=positive_int, default=4, help="Number of simulated sessions")
+    parser.add_argument("--iterations", type=positive_int, default=3, help="Flows run by each session")
+    parser.add_argument("--flow", choices=["url", "text", "both"], default="both")
+    parser.add_argument("--no-near-duplicates", action="store_true",
+                        help="Disable the app's near-duplicate index so every article is extracted")
+    parser.add_argument("--workers", type=positive_int, default=None, help="Job worker pool size of the app")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-script-run and per-job timeout in seconds")
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--max-p99", type=float, help="Exit with status 1 if completion p99 exceeds this many seconds")
+    args = parser.parse_args()
+
+    # Keep load test jobs and history out of the real ones
+    job_dir = tempfile.mkdtemp(prefix="newsnex-loadtest-")
+    env = dict(os.environ, NEWSNEX_JOB_DIR=job_dir, NEWSNEX_HISTORY_DB=os.path.join(job_dir, "history.db"))
+    if args.workers:
+        env["NEWSNEX_JOB_WORKERS"] = str(args.workers)
+    if args.no_near_duplicates:
+        env["NEWSNEX_NEAR_DUPLICATES"] = "0"
+
+    stub, base_url = start_stub_server()
+    port = free_port()
+    app = start_app_server(port, env, args.timeout)
+    try:
+        report, results = asyncio.run(run_load(args, port, base_url, job_dir, app.pid))
+    finally:
+        app.terminate()
+        app.wait()
+        stub.shutdown()
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"report": report, "results": results}, f, indent=2)
+
+    if report["errors"] or (args.max_p99 is not None and (report["completion_p99_s"] or 0) > args.max_p99):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Shared spaCy worker for NewsNex.
+
+Run a single worker per host and point every Streamlit process at it:
+
+    python nlp_worker.py --port 8765
+    NEWSNEX_NLP_WORKER=http://127.0.0.1:8765 streamlit run app.py
+
+The worker owns the only copy of the model and gathers texts from concurrent
+sessions into micro-batches for ``nlp.pipe``.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+import spacy
+from spacy.tokens import DocBin
+
+DEFAULT_MODEL = "en_core_web_sm"
+DEFAULT_PORT = 8765
+
+class MicroBatcher:
+    """Collects texts from concurrent requests and parses them together."""
+
+    def __init__(self, nlp, max_batch=32, max_wait=0.01):
+        self.nlp = nlp
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        threading.Thread(target=self.loop, name="nlp-batcher", daemon=True).start()
+
+    def submit(self, texts):
+        """Queue texts for parsing and return one future per text."""
+        futures = []
+        for text in texts:
+            future = Future()
+            self.queue.put((text, future))
+            futures.append(future)
+        return futures
+
+    def loop(self):
+        while True:
+            # Wait for the first text, then gather more until the batch is full or the window closes
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                docs = list(self.nlp.pipe(text for text, _ in batch))
+            except Exception:
+                # Parse one by one so only the text that fails gets the error
+                for text, future in batch:
+                    try:
+                        future.set_result(self.nlp(text))
+                    except Exception as e:
+                        future.set_exception(e)
+                continue
+            for doc, (_, future) in zip(docs, batch):
+                future.set_result(doc)
+
+class WorkerHandler(BaseHTTPRequestHandler):
+    """HTTP interface: POST /parse with {"texts": [...]} returns a serialized DocBin."""
+    batcher = None
+
+    def do_GET(self):
+        if self.path != "/health":
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def do_POST(self):
+        if self.path != "/parse":
+            self.send_error(404)
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            texts = json.loads(self.rfile.read(length))["texts"]
+        except (ValueError, KeyError, TypeError):
+            texts = None
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            self.send_error(400, "Expected a JSON body with a list of texts")
+            return
+
+        try:
+            docs = [future.result() for future in self.batcher.submit(texts)]
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+
+        body = DocBin(docs=docs).to_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class RemoteNLP:
+    """Stand-in for a spaCy pipeline that parses texts on the shared worker.
+
+    Tokenization for pattern building (``make_doc``) stays local on a blank
+    pipeline of the same language, so matchers work against ``vocab`` as usual.
+    """
+
+    def __init__(self, url, lang="en", timeout=60):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.blank = spacy.blank(lang)
+        self.vocab = self.blank.vocab
+        self.session = requests.Session()
+
+    def ping(self):
+        """Raise if the worker is not reachable."""
+        response = self.session.get(f"{self.url}/health", timeout=5)
+        response.raise_for_status()
+
+    def make_doc(self, text):
+        return self.blank.make_doc(text)
+
+    def pipe(self, texts):
+        texts = list(texts)
+        if not texts:
+            return []
+        response = self.session.post(f"{self.url}/parse", json={"texts": texts}, timeout=self.timeout)
+        response.raise_for_status()
+        return list(DocBin().from_bytes(response.content).get_docs(self.vocab))
+
+    def __call__(self, text):
+        return self.pipe([text])[0]
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared spaCy worker for NewsNex")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--max-batch", type=int, default=32,
+                        help="Maximum number of texts parsed together")
+    parser.add_argument("--max-wait-ms", type=float, default=10,
+                        help="How long to wait for more texts before parsing a batch")
+    args = parser.parse_args()
+
+    WorkerHandler.batcher = MicroBatcher(spacy.load(args.model), args.max_batch, args.max_wait_ms / 1000)
+    server = ThreadingHTTPServer((args.host, args.port), WorkerHandler)
+    print(f"NLP worker serving {args.model} on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()